@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import functools
+import itertools
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Dict, Any, List
 
 import telebot
@@ -34,15 +39,166 @@ STATE_WAIT_DISC = f"{UUID}|STATE|WAIT_DISC"
 CBT_CREATE = f"{UUID}|CB|CREATE"
 CBT_CANCEL = f"{UUID}|CB|CANCEL"
 
+# ---- LOT CREATION
+SAVE_WORKERS = 4
+SAVE_INTERVAL = 0.7  # анти rate-limit: не чаще одного запроса за интервал на все потоки
+PROGRESS_EVERY = 5
+FETCH_WORKERS = 8
+FETCH_INTERVAL = 0.2
+
 # ---- SESSION STORAGE
-SESSION: Dict[int, Dict[str, Any]] = {}
+@dataclass
+class _Session:
+    """Состояние диалога /lcot для одного чата."""
+    __slots__ = ("lot_ids", "bases", "price_1h", "title_ru", "title_en", "durs", "disc")
+    lot_ids: List[int]
+    bases: Dict[int, Dict[str, Any]]
+    price_1h: float
+    title_ru: str
+    title_en: str
+    durs: List[float]
+    disc: float
+
+SESSION: Dict[int, _Session] = {}
+
+# ---- REGEX
+_HY = r"[-\u2010-\u2015\u2212\uFE58\uFE63\uFF0D\u2011]"
+
+# разделители ввода: запятая и точка с запятой сводятся к пробелу
+_SEP_TRANS = str.maketrans(",;", "  ")
+_COMMA_DOT = str.maketrans({",": "."})
+
+# длительность - отдельное слово: число и, возможно, единица (в т.ч. через пробел)
+_DUR_ITER = re.compile(
+    r"(?<!\S)(\d+(?:[.,]\d+)?)(?:\s*("
+    r"h|ч|ч\.|час|часа|часов|"
+    r"d|д|дн|день|дня|дней"
+    r"))?(?!\S)")
+_UNIT_HOURS = {
+    **dict.fromkeys(("h", "ч", "ч.", "час", "часа", "часов"), 1.0),
+    **dict.fromkeys(("d", "д", "дн", "день", "дня", "дней"), 24.0),
+}
+_PCT = re.compile(r"\s*(\d+(?:\.\d+)?)\s*%?\s*")
+_TIMER = re.compile(r"\s*⏱")
+_URL_ID_RE = re.compile(r"(\d{6,})")
+
+# Группы перечислены в порядке приоритета: в тексте переписываются только
+# совпадения самой приоритетной из найденных групп.
+_RU_MASTER = re.compile(
+    rf"(?P<pair>(?P<pair_head>(?:\b(?:на|от)\s*|(?:•\s*)?аренда\s*)?"
+    rf"\b1\s*(?:ч|час(?:а|ов)?)?\.?\s*(?:{_HY}|=)\s*)"
+    r"\d+(?:[.,]\d+)?\s*(?:ч(?:\.|ас(?:а|ов)?)?)\b)"
+    r"|(?P<na_h>\b(?:на|от)\s*\d+(?:[.,]\d+)?\s*(?:ч(?:\.|ас(?:а|ов)?)?)\b)"
+    r"|(?P<na_d>\b(?:на|от)\s*\d+(?:[.,]\d+)?\s*(?:дн(?:я|ей)?|день)\b)"
+    r"|(?P<hours>\b\d+(?:[.,]\d+)?\s*час(?:а|ов)?\b(?:\s*аренды)?)"
+    r"|(?P<rental>(?:•\s*)?аренда\s*\d+(?:[.,]\d+)?\s*ч\.?\b)",
+    re.I)
+_RU_RANK = {g: i for i, g in enumerate(("pair", "na_h", "na_d", "hours", "rental"))}
+# все группы _RU_MASTER содержат число с единицей - быстрая проверка перед полным разбором
+_RU_HAS_UNIT = re.compile(r"\d\s*(?:ч|дн|день)", re.I)
+
+_EN_MASTER = re.compile(
+    r"(?P<for_h>\b(?:for|from)\s*\d+(?:[.,]\d+)?\s*(?:h|hr|hrs|hour|hours)\b)"
+    r"|(?P<for_d>\b(?:for|from)\s*\d+(?:[.,]\d+)?\s*(?:d|day|days)\b)"
+    r"|(?P<rental_h>(?:•\s*)?rental\s*\d+(?:[.,]\d+)?\s*(?:h|hr|hrs)\b)"
+    r"|(?P<rental_d>(?:•\s*)?rental\s*\d+(?:[.,]\d+)?\s*(?:d|day|days)\b)"
+    r"|(?P<hours>\b\d+(?:[.,]\d+)?\s*(?:hour|hours|day|days)\b"
+    r"(?:\s*rental(?!\s*\d+(?:[.,]\d+)?\s*(?:h|hr|hrs|d|day|days)\b))?)",
+    re.I)
+_EN_RANK = {g: i for i, g in enumerate(("for_h", "for_d", "rental_h", "rental_d", "hours"))}
+_EN_HAS_UNIT = re.compile(r"\d\s*[hd]", re.I)
 
 # ---------- helpers
 
+class _RateLimiter:
+    """Выдает слоты для запросов не чаще одного раза в interval секунд."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_rate = _RateLimiter(SAVE_INTERVAL)
+_fetch_rate = _RateLimiter(FETCH_INTERVAL)
+
+_price_fmt = "{:.6f}".format
+
 def _fmt_price(v: float) -> str:
-    return f"{float(v):.6f}"
+    return _price_fmt(float(v))
+
+def _lot_title(it) -> str:
+    return (getattr(it, "description", "") or getattr(it, "title", "") or "").strip()
+
+def _base_from_lot_fields(base_lf) -> dict:
+    """Достает из полей исходного лота то, что нужно для копий."""
+    fields = dict(base_lf.fields)
+    title_ru = fields.get("fields[summary][ru]") or getattr(base_lf, "title_ru", "") or ""
+    title_en = fields.get("fields[summary][en]") or getattr(base_lf, "title_en", "") or ""
+    price_str = fields.get("price") or ""
+    try:
+        price_1h = float(price_str.translate(_COMMA_DOT))
+    except Exception:
+        price_1h = float(getattr(base_lf, "price", 0.0) or 0.0)
+
+    return {
+        "fields": fields,
+        "title_ru": title_ru,
+        "title_en": title_en,
+        "price_1h": price_1h
+    }
+
+def _profile_titles_index(cardinal) -> Dict[str, int]:
+    """Строит индекс {название: ID} по лотам профиля."""
+    prof = getattr(cardinal, "profile", None) or cardinal.account.get_user(cardinal.account.id)
+    lots = []
+    if prof:
+        if hasattr(prof, "get_lots"):
+            lots = prof.get_lots() or []
+    index: Dict[str, int] = {}
+    for it in lots:
+        try:
+            descr = _lot_title(it)
+            if descr:
+                index.setdefault(descr, int(getattr(it, "id")))
+        except Exception:
+            continue
+    return index
+
+class _TitlesIndex:
+    """Индекс лотов профиля на один запуск создания.
+
+    Профиль перечитывается, только если после прошлого чтения были созданы лоты.
+    """
+
+    def __init__(self, cardinal):
+        self._cardinal = cardinal
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] | None = None
+        self._stale = True
 
-def _guess_created_id(cardinal, fields: dict) -> int | None:
+    def mark_created(self):
+        with self._lock:
+            self._stale = True
+
+    def get(self) -> Dict[str, int]:
+        with self._lock:
+            if self._index is None or self._stale:
+                try:
+                    self._index = _profile_titles_index(self._cardinal)
+                except Exception:
+                    self._index = {}
+                self._stale = False
+            return self._index
+
+def _guess_created_id(cardinal, fields: dict, titles_index: Dict[str, int] | None = None) -> int | None:
     """Пробует определить ID созданного лота."""
     for k in ("offer_id", "id"):
         v = (fields.get(k) or "").strip()
@@ -51,55 +207,30 @@ def _guess_created_id(cardinal, fields: dict) -> int | None:
 
     ru = (fields.get("fields[summary][ru]") or "").strip()
     en = (fields.get("fields[summary][en]") or "").strip()
-    titles = {t for t in (ru, en) if t}
 
     try:
-        prof = getattr(cardinal, "profile", None) or cardinal.account.get_user(cardinal.account.id)
-        lots = []
-        if prof:
-            if hasattr(prof, "get_lots"):
-                lots = prof.get_lots() or []
-        for it in lots:
-            try:
-                descr = (getattr(it, "description", "") or getattr(it, "title", "") or "").strip()
-                if descr and descr in titles:
-                    return int(getattr(it, "id"))
-            except Exception:
-                continue
+        if titles_index is None:
+            titles_index = _profile_titles_index(cardinal)
+        return next((titles_index[t] for t in (ru, en) if t and t in titles_index), None)
     except Exception:
-        pass
-    return None
+        return None
 
 def _parse_durations(text: str) -> List[float]:
     """Парсит длительности и возвращает часы."""
     durs: List[float] = []
     s = (text or "").lower()
-    tokens = re.split(r"[,\s;]+", s.strip())
-    for tok in tokens:
-        if not tok:
-            continue
-        m = re.fullmatch(
-            r"(\d+(?:[.,]\d+)?)(?:\s*("
-            r"h|ч|ч\.|час|часа|часов|"
-            r"d|д|дн|день|дня|дней"
-            r"))?", tok)
-        if not m:
-            continue
-        val = float(m.group(1).replace(",", "."))
-        unit = (m.group(2) or "h").strip()
-
-        if unit in ("h", "ч", "ч.", "час", "часа", "часов"):
-            hours = val
-        elif unit in ("d", "д", "дн", "день", "дня", "дней"):
-            hours = val * 24.0
-        else:
+    for m in _DUR_ITER.finditer(s.translate(_SEP_TRANS)):
+        mult = _UNIT_HOURS.get(m.group(2) or "h")
+        if mult is None:
             continue
+        hours = float(m.group(1).translate(_COMMA_DOT)) * mult
 
         if hours > 0:
             durs.append(round(hours, 2))
 
-    return sorted(list(dict.fromkeys(durs)))
+    return sorted({*durs})
 
+@functools.lru_cache(maxsize=1024)
 def _en_duration_phrase(hours: float) -> str:
     """Форматирует длительность на английском."""
     if abs(hours - round(hours)) < 1e-9:
@@ -113,6 +244,7 @@ def _en_duration_phrase(hours: float) -> str:
         unit = "hours"
     return f"{h_str} {unit}"
 
+@functools.lru_cache(maxsize=1024)
 def _ru_days_phrase(hours: float) -> str | None:
     """Возвращает дни, если кратно 24 часам."""
     if abs(hours - round(hours)) < 1e-9:
@@ -122,6 +254,7 @@ def _ru_days_phrase(hours: float) -> str | None:
             return f"{d} " + _ru_num_word(d, ("день", "дня", "дней"))
     return None
 
+@functools.lru_cache(maxsize=1024)
 def _ru_duration_phrase(hours: float) -> str:
     """Форматирует длительность по-русски."""
     days = _ru_days_phrase(hours)
@@ -129,29 +262,36 @@ def _ru_duration_phrase(hours: float) -> str:
         return days
     return _ru_hours_phrase(hours)
 
-def _ru_num_word(n: float, forms: tuple[str, str, str]) -> str:
-    """Подбирает правильную форму слова для числа."""
+@functools.lru_cache(maxsize=1024)
+def _num_form_index(n: float) -> int:
+    """Индекс формы слова для числа: 0 - "час", 1 - "часа", 2 - "часов"."""
     try:
         f = float(n)
     except Exception:
         f = n
     if isinstance(f, float) and not f.is_integer():
-        return forms[1]
+        return 1
     n = int(round(f)) % 100
     if 11 <= n <= 19:
-        return forms[2]
+        return 2
     n1 = n % 10
     if n1 == 1:
-        return forms[0]
+        return 0
     if 2 <= n1 <= 4:
-        return forms[1]
-    return forms[2]
+        return 1
+    return 2
+
+def _ru_num_word(n: float, forms: tuple[str, str, str]) -> str:
+    """Подбирает правильную форму слова для числа."""
+    return forms[_num_form_index(n)]
 
+@functools.lru_cache(maxsize=1024)
 def _ru_hours_phrase(hours: float) -> str:
     h_str = _hours_str(hours)
     word = _ru_num_word(hours, ("час", "часа", "часов"))
     return f"{h_str} {word}"
 
+@functools.lru_cache(maxsize=1024)
 def _fmt_short_duration(hours: float) -> str:
     """Короткий формат длительности для предпросмотра."""
     if abs(hours - round(hours)) < 1e-9 and int(hours) >= 24 and int(hours) % 24 == 0:
@@ -159,43 +299,50 @@ def _fmt_short_duration(hours: float) -> str:
         return f"{d} д"
     return f"{_hours_str(hours)} ч"
 
+@functools.lru_cache(maxsize=1024)
 def _hours_str(hours: float) -> str:
-    return (str(hours).rstrip("0").rstrip(".") if isinstance(hours, float) else str(hours))
+    if isinstance(hours, float):
+        # repr дробного float не содержит хвостовых нулей, целые печатаем без ".0"
+        return str(int(hours)) if hours.is_integer() else repr(hours)
+    return str(hours)
+
+def _sub_one_pass(master: re.Pattern, rank: Dict[str, int], text: str, repl) -> str | None:
+    """Один проход по тексту: заменяет совпадения самой приоритетной группы."""
+    matches = list(master.finditer(text))
+    if not matches:
+        return None
+    best = min(rank[m.lastgroup] for m in matches)
+    out, pos = [], 0
+    for m in matches:
+        if rank[m.lastgroup] == best:
+            out.append(text[pos:m.start()])
+            out.append(repl(m))
+            pos = m.end()
+    out.append(text[pos:])
+    return "".join(out)
 
 def _replace_hours_in_title(title: str, hours: float, locale: str = "ru", allow_insert: bool = True) -> str:
     """Нормализует упоминание длительности в тексте."""
     if not title:
         return title
+    return _rewrite_hours(title, hours, locale, allow_insert)
 
-    h_str = _hours_str(hours)
-    t = title
-
-    HY = r"[-\u2010-\u2015\u2212\uFE58\uFE63\uFF0D\u2011]"
-
+@functools.lru_cache(maxsize=2048)
+def _rewrite_hours(t: str, hours: float, locale: str, allow_insert: bool) -> str:
+    """Чистое ядро _replace_hours_in_title, кэшируется по (текст, часы)."""
     if locale.lower() == "ru":
         target_phrase = f"на {_ru_duration_phrase(hours)}"
 
         ru_hours = _ru_hours_phrase(hours)
 
-        patterns = [
-            (rf"(\b1\s*(?:ч|час(?:а|ов)?)?\.?\s*(?:{HY}|=)\s*)\d+(?:[.,]\d+)?\s*(?:ч(?:\.|ас(?:а|ов)?)?)\b",
-             lambda m: f"{m.group(1)}{ru_hours}"),
-            (r"\b(?:на|от)\s*\d+(?:[.,]\d+)?\s*(?:ч(?:\.|ас(?:а|ов)?)?)\b",
-             lambda m: target_phrase),
-
-            (r"\b(?:на|от)\s*\d+(?:[.,]\d+)?\s*(?:дн(?:я|ей)?|день)\b",
-             lambda m: target_phrase),
+        def _dispatch_ru(m: re.Match) -> str:
+            if m.lastgroup == "pair":
+                return f"{m.group('pair_head')}{ru_hours}"
+            return target_phrase
 
-            (r"\b\d+(?:[.,]\d+)?\s*час(?:а|ов)?\b(?:\s*аренды)?",
-             lambda m: target_phrase),
-
-            (r"(?:•\s*)?аренда\s*\d+(?:[.,]\d+)?\s*ч\.?\b",
-             lambda m: target_phrase),
-        ]
-
-        for pat, repl in patterns:
-            new_t, n = re.subn(pat, repl, t, flags=re.IGNORECASE)
-            if n:
+        if _RU_HAS_UNIT.search(t):
+            new_t = _sub_one_pass(_RU_MASTER, _RU_RANK, t, _dispatch_ru)
+            if new_t is not None:
                 return new_t
 
         if not allow_insert:
@@ -203,7 +350,7 @@ def _replace_hours_in_title(title: str, hours: float, locale: str = "ru", allow_
 
         insert = f" {target_phrase} "
         if "⏱" in t:
-            return re.sub(r"\s*⏱", insert + "⏱", t, count=1)
+            return _TIMER.sub(insert + "⏱", t, count=1)
         if target_phrase not in t:
             return (t + insert).strip()
         return t
@@ -211,22 +358,9 @@ def _replace_hours_in_title(title: str, hours: float, locale: str = "ru", allow_
     else:
         target_phrase = f"for {_en_duration_phrase(hours)}"
 
-        patterns = [
-            (r"\b(?:for|from)\s*\d+(?:[.,]\d+)?\s*(?:h|hr|hrs|hour|hours)\b",
-             lambda m: target_phrase),
-            (r"\b(?:for|from)\s*\d+(?:[.,]\d+)?\s*(?:d|day|days)\b",
-             lambda m: target_phrase),
-            (r"(?:•\s*)?rental\s*\d+(?:[.,]\d+)?\s*(?:h|hr|hrs)\b",
-             lambda m: target_phrase),
-            (r"(?:•\s*)?rental\s*\d+(?:[.,]\d+)?\s*(?:d|day|days)\b",
-             lambda m: target_phrase),
-            (r"\b\d+(?:[.,]\d+)?\s*(?:hour|hours|day|days)\b(?:\s*rental)?",
-             lambda m: target_phrase),
-        ]
-
-        for pat, repl in patterns:
-            new_t, n = re.subn(pat, repl, t, flags=re.IGNORECASE)
-            if n:
+        if _EN_HAS_UNIT.search(t):
+            new_t = _sub_one_pass(_EN_MASTER, _EN_RANK, t, lambda m: target_phrase)
+            if new_t is not None:
                 return new_t
 
         if not allow_insert:
@@ -234,24 +368,40 @@ def _replace_hours_in_title(title: str, hours: float, locale: str = "ru", allow_
 
         insert = f" • {target_phrase} "
         if "⏱" in t:
-            return re.sub(r"\s*⏱", insert + "⏱", t, count=1)
+            return _TIMER.sub(insert + "⏱", t, count=1)
         if target_phrase not in t:
             return (t + insert).strip()
         return t
 
+class _SrcAgg:
+    """Созданные копии одного исходного лота: ID и длительности."""
+    __slots__ = ("ids", "hours", "n")
+
+    def __init__(self, size: int):
+        self.ids: List[int | None] = [None] * size
+        self.hours: List[float] = [0.0] * size
+        self.n = 0
+
+    def add(self, new_id: int | None, hours: float):
+        self.ids[self.n] = new_id
+        self.hours[self.n] = hours
+        self.n += 1
+
+def _chunked(lines: List[str], limit: int = 3500):
+    """Склеивает строки в сообщения длиной не больше limit."""
+    start, offset, prev = 0, 0, 0
+    for i, total in enumerate(itertools.accumulate(len(ln) + 1 for ln in lines)):
+        if i > start and total - offset > limit:
+            yield "\n".join(lines[start:i])
+            start, offset = i, prev
+        prev = total
+    if start < len(lines):
+        yield "\n".join(lines[start:])
+
 def _build_preview_lines(base_title_ru: str, durs: List[float], price_1h: float, disc: float) -> List[str]:
-    lines = []
-    for h in durs:
-        pr = price_1h * h
-        if disc:
-            pr *= (1 - disc / 100.0)
-        pr_i = int(round(pr))
-        label = _fmt_short_duration(h)
-        if disc:
-            lines.append(f"• {label} → {pr_i} (−{disc:.0f}%)")
-        else:
-            lines.append(f"• {label} → {pr_i}")
-    return lines
+    k = (1 - disc / 100.0) if disc else 1.0
+    suffix = f" (−{disc:.0f}%)" if disc else ""
+    return [f"• {_fmt_short_duration(h)} → {int(round(price_1h * h * k))}{suffix}" for h in durs]
 
 # ---------- plugin init
 
@@ -270,12 +420,15 @@ def init_commands(cardinal: Cardinal, *args):
         )
         tg.set_state(m.chat.id, msg.id, m.from_user.id, STATE_WAIT_LOT)
 
+    def fetch_lot_fields(lot_id: int) -> FunPayAPI.types.LotFields:
+        _fetch_rate.wait()
+        return cardinal.account.get_lot_fields(lot_id)
+
     def handle_lot_id(m: Message):
         tg.clear_state(m.chat.id, m.from_user.id, True)
         raw = (m.text or "").strip()
         ids = []
-        for t in re.split(r"[,\s;]+", raw):
-            t = t.strip()
+        for t in raw.translate(_SEP_TRANS).split():
             if t.isdigit():
                 ids.append(int(t))
         ids = list(dict.fromkeys(ids))
@@ -284,46 +437,38 @@ def init_commands(cardinal: Cardinal, *args):
             return
 
         bases = {}
-        for lot_id in ids:
-            try:
-                base_lf: FunPayAPI.types.LotFields = cardinal.account.get_lot_fields(lot_id)
-            except Exception:
-                logger.debug("TRACEBACK", exc_info=True)
-                bot.send_message(m.chat.id, f"❌ Не смог получить данные лота #{lot_id}.")
-                return
-
-            fields = dict(base_lf.fields)
-            title_ru = fields.get("fields[summary][ru]") or getattr(base_lf, "title_ru", "") or ""
-            title_en = fields.get("fields[summary][en]") or getattr(base_lf, "title_en", "") or ""
-            price_str = fields.get("price") or ""
-            try:
-                price_1h = float(price_str.replace(",", "."))
-            except Exception:
-                price_1h = float(getattr(base_lf, "price", 0.0) or 0.0)
-
-            bases[lot_id] = {
-                "fields": fields,
-                "title_ru": title_ru,
-                "title_en": title_en,
-                "price_1h": price_1h
-            }
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(ids))) as pool:
+            futures = [pool.submit(fetch_lot_fields, lot_id) for lot_id in ids]
+            for lot_id, fut in zip(ids, futures):
+                try:
+                    base_lf: FunPayAPI.types.LotFields = fut.result()
+                except Exception:
+                    logger.debug("TRACEBACK", exc_info=True)
+                    for f in futures:
+                        f.cancel()
+                    bot.send_message(m.chat.id, f"❌ Не смог получить данные лота #{lot_id}.")
+                    return
+                bases[lot_id] = _base_from_lot_fields(base_lf)
+        elapsed = time.monotonic() - started
 
         first_id = ids[0]
-        SESSION[m.chat.id] = {
-            "lot_ids": ids,
-            "bases": bases,
-            "price_1h": bases[first_id]["price_1h"],
-            "title_ru": bases[first_id]["title_ru"],
-            "title_en": bases[first_id]["title_en"],
-            "durs": [],
-            "disc": 0.0
-        }
+        SESSION[m.chat.id] = _Session(
+            lot_ids=ids,
+            bases=bases,
+            price_1h=bases[first_id]["price_1h"],
+            title_ru=bases[first_id]["title_ru"],
+            title_en=bases[first_id]["title_en"],
+            durs=[],
+            disc=0.0
+        )
 
         msg = bot.send_message(
             m.chat.id,
             "⏱ Укажите длительности через запятую.\n"
             "Примеры: `6`, `0.5`, `6h` / `6ч`, `12 часов`, `1d` / `1д`, `7д`.\n\n"
-            f"Базовая цена (за 1 час, лот #{first_id}): *{int(round(SESSION[m.chat.id]['price_1h']))}*",
+            f"Базовая цена (за 1 час, лот #{first_id}): *{int(round(SESSION[m.chat.id].price_1h))}*\n"
+            f"_Данные {len(ids)} лот(ов) получены за {elapsed:.1f} с._",
             parse_mode="Markdown",
             reply_markup=skb.CLEAR_STATE_BTN()
         )
@@ -341,8 +486,7 @@ def init_commands(cardinal: Cardinal, *args):
             bot.send_message(m.chat.id, "❌ Не понял длительности. Пример: `0.5, 1, 2, 3`", parse_mode="Markdown")
             return
 
-        sess["durs"] = durs
-        SESSION[m.chat.id] = sess
+        sess.durs = durs
 
         msg = bot.send_message(
             m.chat.id,
@@ -360,8 +504,8 @@ def init_commands(cardinal: Cardinal, *args):
             bot.send_message(m.chat.id, "❌ Сессия не найдена. Запустите /lcot заново.")
             return
         raw = (m.text or "").strip()
-        raw = raw.replace(",", ".")
-        m_pct = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*%?\s*", raw)
+        raw = raw.translate(_COMMA_DOT)
+        m_pct = _PCT.fullmatch(raw)
         if not m_pct:
             bot.send_message(m.chat.id, "❌ Скидка должна быть от 0 до 90.")
             return
@@ -369,14 +513,13 @@ def init_commands(cardinal: Cardinal, *args):
         if disc < 0 or disc > 90:
             bot.send_message(m.chat.id, "❌ Скидка должна быть от 0 до 90.")
             return
-        sess["disc"] = disc
-        SESSION[m.chat.id] = sess
+        sess.disc = disc
 
-        lot_ids = sess.get("lot_ids") or [sess.get("lot_id")]
+        lot_ids = sess.lot_ids
         first_id = lot_ids[0]
-        lines = _build_preview_lines(sess["title_ru"], sess["durs"], sess["price_1h"], disc)
+        lines = _build_preview_lines(sess.title_ru, sess.durs, sess.price_1h, disc)
 
-        total = len(lot_ids) * len(sess["durs"])
+        total = len(lot_ids) * len(sess.durs)
         kb = K()
         kb.row(B("✅ Создать", callback_data=CBT_CREATE))
         kb.row(B("❌ Отмена", callback_data=CBT_CANCEL))
@@ -399,6 +542,38 @@ def init_commands(cardinal: Cardinal, *args):
         except Exception:
             pass
         
+    def create_lot(fields: dict, titles: _TitlesIndex) -> int | None:
+        """Создает лот и пытается определить его ID. Вызывается из пула потоков."""
+        lot = FunPayAPI.types.LotFields(0, fields)
+        _rate.wait()
+        ret = cardinal.account.save_lot(lot)
+        titles.mark_created()
+
+        new_id = None
+        if isinstance(ret, dict):
+            m = _URL_ID_RE.search(str(ret.get("url", "")))
+            if m:
+                new_id = int(m.group(1))
+        elif isinstance(ret, int) and ret > 0:
+            new_id = ret
+        elif isinstance(ret, str) and ret.isdigit():
+            new_id = int(ret)
+
+        if not new_id:
+            for attr in ("lot_id", "id", "offer_id"):
+                v = getattr(lot, attr, None)
+                if isinstance(v, int) and v > 0:
+                    new_id = v; break
+                if isinstance(v, str) and v.isdigit() and int(v) > 0:
+                    new_id = int(v); break
+
+        if not new_id:
+            try:
+                new_id = _guess_created_id(cardinal, fields, titles.get())
+            except Exception:
+                new_id = None
+        return new_id
+
     def cb_create(call: telebot.types.CallbackQuery):
         chat_id = call.message.chat.id
         sess = SESSION.get(chat_id)
@@ -412,141 +587,93 @@ def init_commands(cardinal: Cardinal, *args):
             pass
 
         created, failed = 0, 0
-        created_details = []
-
-        disc = float(sess.get("disc", 0.0))
-        durs = list(sess.get("durs") or [])
+        tasks = []
 
-        lot_ids = sess.get("lot_ids") or [sess.get("lot_id")]
-        bases = sess.get("bases")
+        disc = float(sess.disc)
+        durs = list(sess.durs)
 
-        single_base_fields = dict(sess.get("base_fields") or {})
-        single_title_ru = sess.get("title_ru") or ""
-        single_title_en = sess.get("title_en") or ""
-        try:
-            single_price_1h = float(sess.get("price_1h") or 0.0)
-        except Exception:
-            single_price_1h = 0.0
+        lot_ids = sess.lot_ids
+        bases = sess.bases
 
+        csrf = cardinal.account.csrf_token
         for src_id in lot_ids:
-            if bases and src_id in bases:
-                base = bases[src_id]
-                base_fields = dict(base["fields"])
-                title_ru = base.get("title_ru", "")
-                title_en = base.get("title_en", "")
-                try:
-                    price_1h = float(base.get("price_1h") or 0.0)
-                except Exception:
-                    price_1h = 0.0
-            else:
-                base_fields = dict(single_base_fields)
-                title_ru = single_title_ru
-                title_en = single_title_en
-                price_1h = single_price_1h
+            base = bases[src_id]
+            base_fields = base["fields"]
+            title_ru = base.get("title_ru", "")
+            title_en = base.get("title_en", "")
+            try:
+                price_1h = float(base.get("price_1h") or 0.0)
+            except Exception:
+                price_1h = 0.0
+
+            base_snapshot = {**base_fields, "offer_id": "0", "csrf_token": csrf}
+
+            # тексты зависят только от (src, h) - считаем один раз на исходник
+            desc_ru = base_fields.get("fields[desc][ru]")
+            desc_en = base_fields.get("fields[desc][en]")
+            ru_titles = {h: _replace_hours_in_title(title_ru, h, "ru") for h in durs} if title_ru else {}
+            en_titles = {h: _replace_hours_in_title(title_en, h, "en") for h in durs} if title_en else {}
+            ru_descs = {h: _replace_hours_in_title(desc_ru, h, "ru", allow_insert=False) for h in durs} if desc_ru else {}
+            en_descs = {h: _replace_hours_in_title(desc_en, h, "en", allow_insert=False) for h in durs} if desc_en else {}
 
             for h in durs:
+                price = price_1h * float(h)
+                if disc:
+                    price *= (1 - disc / 100.0)
+                overrides = {"price": _fmt_price(price)}
+                if title_ru:
+                    overrides["fields[summary][ru]"] = ru_titles[h]
+                if title_en:
+                    overrides["fields[summary][en]"] = en_titles[h]
+                if desc_ru:
+                    overrides["fields[desc][ru]"] = ru_descs[h]
+                if desc_en:
+                    overrides["fields[desc][en]"] = en_descs[h]
+                tasks.append((src_id, h, {**base_snapshot, **overrides}))
+
+        titles = _TitlesIndex(cardinal)
+        results: list = [None] * len(tasks)
+        with ThreadPoolExecutor(max_workers=SAVE_WORKERS) as pool:
+            futures = {pool.submit(create_lot, task[2], titles): i for i, task in enumerate(tasks)}
+            for done, fut in enumerate(as_completed(futures), 1):
+                i = futures[fut]
+                src_id, h, _ = tasks[i]
                 try:
-                    fields = dict(base_fields)
-
-                    price = price_1h * float(h)
-                    if disc:
-                        price *= (1 - disc / 100.0)
-                    fields["price"] = _fmt_price(price)
-
-                    if title_ru:
-                        fields["fields[summary][ru]"] = _replace_hours_in_title(title_ru, h, "ru")
-                    if title_en:
-                        fields["fields[summary][en]"] = _replace_hours_in_title(title_en, h, "en")
-
-                    desc_ru = fields.get("fields[desc][ru]")
-                    if desc_ru:
-                        fields["fields[desc][ru]"] = _replace_hours_in_title(desc_ru, h, "ru", allow_insert=False)
-                    desc_en = fields.get("fields[desc][en]")
-                    if desc_en:
-                        fields["fields[desc][en]"] = _replace_hours_in_title(desc_en, h, "en", allow_insert=False)
-
-                    fields["offer_id"] = "0"
-                    fields["csrf_token"] = cardinal.account.csrf_token
-
-                    lot = FunPayAPI.types.LotFields(0, fields)
-                    time.sleep(0.7)  # анти rate-limit
-                    ret = cardinal.account.save_lot(lot)
-
-                    if isinstance(ret, dict):
-                        u = str(ret.get("url", ""))
-                        m = re.search(r"(\d{6,})", u)
-                        if m:
-                            new_id = int(m.group(1))
-
-                    new_id = None
-                    if isinstance(ret, int) and ret > 0:
-                        new_id = ret
-                    elif isinstance(ret, str) and ret.isdigit():
-                        new_id = int(ret)
-
-                    if not new_id:
-                        for attr in ("lot_id", "id", "offer_id"):
-                            v = getattr(lot, attr, None)
-                            if isinstance(v, int) and v > 0:
-                                new_id = v; break
-                            if isinstance(v, str) and v.isdigit() and int(v) > 0:
-                                new_id = int(v); break
-
-                    if not new_id:
-                        try:
-                            new_id = _guess_created_id(cardinal, fields)
-                        except Exception:
-                            new_id = None
-
+                    results[i] = (fut.result(), float(h), int(src_id))
                     created += 1
-                    created_details.append((new_id, float(h), int(src_id)))
                 except Exception as ex:
                     failed += 1
                     logger.error(f"[LCOT] error creating lot (src={src_id}, h={h}): {ex}")
+                if done % PROGRESS_EVERY == 0 and done < len(tasks):
+                    try:
+                        bot.edit_message_text(f"⏳ Создаю лоты... {done}/{len(tasks)}", chat_id, call.message.id)
+                    except Exception:
+                        pass
+        created_details = [r for r in results if r is not None]
 
         SESSION.pop(chat_id, None)
         bot.send_message(chat_id, f"✅ Готово. Создано: {created}. Ошибок: {failed}.")
 
-        by_src: dict[int, dict] = {}
+        # на каждый исходник создается не больше len(durs) копий
+        by_src = {src: _SrcAgg(len(durs)) for src in (lot_ids or [])}
         for new_id, hours, src in created_details:
-            d = by_src.setdefault(int(src), {"ids": [], "hours": []})
-            d["ids"].append(new_id if new_id else None)
-            d["hours"].append(hours)
+            by_src[src].add(new_id if new_id else None, hours)
 
-        lines_ids_only = []
-        for src in (lot_ids or []):
-            d = by_src.get(int(src), {"ids": [], "hours": []})
-            ids = [str(x) for x in d["ids"] if isinstance(x, int) and x > 0]
-            if ids:
-                lines_ids_only.append(f'(из "{int(src)}") ' + ", ".join(ids))
-        if lines_ids_only:
-            chunk, acc = [], 0
-            for ln in lines_ids_only:
-                if acc + len(ln) + 1 > 3500:
-                    bot.send_message(chat_id, "🆕 Новые лоты (только ID):\n" + "\n".join(chunk))
-                    chunk, acc = [], 0
-                chunk.append(ln); acc += len(ln) + 1
-            if chunk:
-                bot.send_message(chat_id, "🆕 Новые лоты (только ID):\n" + "\n".join(chunk))
-
-        lines_with_time = []
+        lines_ids_only, lines_with_time = [], []
         for src in (lot_ids or []):
-            d = by_src.get(int(src), {"ids": [], "hours": []})
-            ids = [str(x) for x in d["ids"] if isinstance(x, int) and x > 0]
-            ids_join = ", ".join(ids) if ids else "—"
-            times = ", ".join(_ru_duration_phrase(h) for h in d["hours"])
-            if d["hours"]:
-                lines_with_time.append(f'(из "{int(src)}") ' + ids_join + " - " + times)
-
-        if lines_with_time:
-            chunk, acc = [], 0
-            for ln in lines_with_time:
-                if acc + len(ln) + 1 > 3500:
-                    bot.send_message(chat_id, "🕒 Новые лоты (ID + длительности):\n" + "\n".join(chunk))
-                    chunk, acc = [], 0
-                chunk.append(ln); acc += len(ln) + 1
-            if chunk:
-                bot.send_message(chat_id, "🕒 Новые лоты (ID + длительности):\n" + "\n".join(chunk))
+            agg = by_src[src]
+            if not agg.n:
+                continue
+            ids_join = ", ".join(str(x) for x in agg.ids[:agg.n] if isinstance(x, int) and x > 0)
+            times = ", ".join(_ru_duration_phrase(h) for h in agg.hours[:agg.n])
+            if ids_join:
+                lines_ids_only.append(f'(из "{src}") ' + ids_join)
+            lines_with_time.append(f'(из "{src}") ' + (ids_join or "—") + " - " + times)
+
+        for text in _chunked(lines_ids_only):
+            bot.send_message(chat_id, "🆕 Новые лоты (только ID):\n" + text)
+        for text in _chunked(lines_with_time):
+            bot.send_message(chat_id, "🕒 Новые лоты (ID + длительности):\n" + text)
 
     cardinal.add_telegram_commands(UUID, [
         ("lcot", "создать копии лота для выбранных длительностей с перерасчётом цены", True),